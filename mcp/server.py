@@ -1,5 +1,8 @@
+import asyncio
+from functools import lru_cache
 from pathlib import Path
 import sqlite3
+import threading
 from typing import List, Dict, Optional
 from fastmcp import FastMCP
 import os
@@ -7,114 +10,132 @@ import sys
 
 DB_PATH = Path(__file__).parent.parent / "data" / "polar.db"
 
-# Add parent directory to path for imports
+# Add parent directory (and the accesslink example, for utils.load_config)
+# to the path once at module load instead of on every tool call
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "accesslink-example-python"))
+
+from polar_etl.notion_running import (
+    acreate_running_page,
+    aupdate_running_page,
+    afind_running_page_by_week,
+)
 
 mcp = FastMCP("Marathon Polar")
 
 
+@lru_cache(maxsize=4)
+def _load_config(path: str) -> Dict:
+    # Imported lazily so the server still starts without the accesslink
+    # checkout; lru_cache means the YAML is parsed once per path
+    from utils import load_config
+
+    return load_config(path)
+
+# Read-tuned pragmas applied once per connection. WAL lets concurrent
+# readers proceed without blocking each other.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA cache_size=-32000;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA temp_store=MEMORY;",
+)
+
+_local = threading.local()
+
+
+def _dict_row(cursor, row):
+    # Build result dicts directly in the row factory so tools can return
+    # fetchall() as-is instead of copying every column key-by-key.
+    return dict(zip([d[0] for d in cursor.description], row))
+
+# Constant SQL text lets sqlite3's per-connection statement cache reuse the
+# prepared plan instead of re-parsing on every tool call.
+SQL_RECENT_SESSIONS = """
+    SELECT session_id, ts_start, ts_end, sport,
+        distance_m, duration_s, kcal,
+        avg_hr, max_hr, device, training_load
+    FROM sessions
+    ORDER BY ts_start DESC
+    LIMIT ?
+"""
+
+SQL_RECENT_METRICS = """
+    SELECT date,
+           resting_hr,
+           hrv_rmssd,
+           vo2max,
+           weight_kg,
+           sleep_hours
+    FROM metrics
+    ORDER BY date DESC
+    LIMIT ?
+"""
+
+
 def get_conn():
+    # Opening the database file on every tool call is pure overhead for a
+    # long-running server; keep one connection per thread instead.
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
     if not DB_PATH.exists():
         raise FileNotFoundError(f"DB not found at {DB_PATH}")
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn.row_factory = _dict_row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    _local.conn = conn
     return conn
 
 
+def _fetch(sql: str, limit: int) -> List[Dict]:
+    try:
+        conn = get_conn()
+    except FileNotFoundError as e:
+        raise ValueError(f"Database error: {e}")
+
+    return conn.execute(sql, (limit,)).fetchall()
+
+
 @mcp.tool()
-def get_recent_sessions(limit: int = 10) -> List[Dict]:
+async def get_recent_sessions(limit: int = 10) -> List[Dict]:
     """
     Return most recent sessions (runs) from SQLite.
-    
+
     Args:
         limit: Number of sessions to return (1-100)
     """
     if limit < 1 or limit > 100:
         raise ValueError("limit must be between 1 and 100")
-    
-    try:
-        conn = get_conn()
-    except FileNotFoundError as e:
-        raise ValueError(f"Database error: {e}")
 
-    rows = conn.execute(
-        """
-        SELECT session_id, ts_start, ts_end, sport, 
-            distance_m, duration_s, kcal, 
-            avg_hr, max_hr, device, training_load
-        FROM sessions
-        ORDER BY ts_start DESC
-        LIMIT ?
-        """,
-        (limit,),
-    ).fetchall()
-    conn.close()
-
-    return [
-        {
-            "session_id": r["session_id"],
-            "ts_start": r["ts_start"],
-            "ts_end": r["ts_end"],
-            "sport": r["sport"],
-            "distance_m": r["distance_m"],
-            "duration_s": r["duration_s"],
-            "kcal": r["kcal"],
-            "avg_hr": r["avg_hr"],
-            "max_hr": r["max_hr"],
-            "device": r["device"],
-            "training_load": r["training_load"],
-        }
-        for r in rows
-    ]
+    # SQLite releases the GIL while executing, so running the read in a
+    # worker thread keeps the event loop free for concurrent tool calls
+    return await asyncio.to_thread(_fetch, SQL_RECENT_SESSIONS, limit)
 
 
 @mcp.tool()
-def get_recent_metrics(limit: int = 14) -> List[Dict]:
+async def get_recent_metrics(limit: int = 14) -> List[Dict]:
     """
     Return recent daily metrics (hrv, rhr, vo2, weight, sleep).
-    
+
     Args:
         limit: Number of days to return (1-60)
     """
     if limit < 1 or limit > 60:
         raise ValueError("limit must be between 1 and 60")
-    
-    try:
-        conn = get_conn()
-    except FileNotFoundError as e:
-        raise ValueError(f"Database error: {e}")
 
-    rows = conn.execute(
-        """
-        SELECT date,
-               resting_hr,
-               hrv_rmssd,
-               vo2max,
-               weight_kg,
-               sleep_hours
-        FROM metrics
-        ORDER BY date DESC
-        LIMIT ?
-        """,
-        (limit,),
-    ).fetchall()
-    conn.close()
-
-    return [
-        {
-            "date": r["date"],
-            "resting_hr": r["resting_hr"],
-            "hrv_rmssd": r["hrv_rmssd"],
-            "vo2max": r["vo2max"],
-            "weight_kg": r["weight_kg"],
-            "sleep_hours": r["sleep_hours"],
-        }
-        for r in rows
-    ]
+    return await asyncio.to_thread(_fetch, SQL_RECENT_METRICS, limit)
+
+
+# Memo of (database_id, week) -> page_id so repeat writes to the same week
+# in one server session skip the Notion lookup entirely
+_page_ids: Dict[tuple, str] = {}
 
 
 @mcp.tool()
-def write_to_notion_running(
+async def write_to_notion_running(
     week: str,
     status: str = "In Progress",
     weekly_goal: Optional[str] = None,
@@ -126,6 +147,7 @@ def write_to_notion_running(
     week_start_date: Optional[str] = None,
     database_id: Optional[str] = None,
     update_existing: bool = True,
+    page_id: Optional[str] = None,
 ) -> Dict:
     """
     Write running progress and coaching data to Notion running database.
@@ -144,29 +166,16 @@ def write_to_notion_running(
         week_start_date: Week start date (YYYY-MM-DD format)
         database_id: Notion database ID (optional, uses config if not provided)
         update_existing: If True, update existing page for this week; if False, create new
-    
+        page_id: Notion page ID for this week, if already known (skips the lookup)
+
     Returns:
         Created or updated page data from Notion
     """
-    try:
-        from polar_etl.notion_running import (
-            create_running_page,
-            update_running_page,
-            find_running_page_by_week,
-        )
-        # Import utils from accesslink-example-python
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent.parent / "accesslink-example-python"))
-        from utils import load_config
-    except ImportError as e:
-        raise ValueError(f"Could not import Notion modules: {e}")
-    
     # Get database ID from config if not provided
     if not database_id:
         try:
             config_path = Path(__file__).parent.parent / "accesslink-example-python" / "config.yml"
-            config = load_config(str(config_path))
+            config = _load_config(str(config_path))
             database_id = config.get("notion_running_db_id")
             if not database_id:
                 raise ValueError(
@@ -187,12 +196,18 @@ def write_to_notion_running(
     
     try:
         if update_existing:
-            # Try to find existing page
-            existing_page = find_running_page_by_week(database_id, week)
-            if existing_page:
-                # Update existing page
-                result = update_running_page(
-                    existing_page["id"],
+            # Use the caller-supplied or remembered page_id before falling
+            # back to a Notion lookup
+            if not page_id:
+                page_id = _page_ids.get((database_id, week))
+            if not page_id:
+                existing_page = await afind_running_page_by_week(database_id, week)
+                if existing_page:
+                    page_id = existing_page["id"]
+            if page_id:
+                _page_ids[(database_id, week)] = page_id
+                result = await aupdate_running_page(
+                    page_id,
                     status=status,
                     weekly_goal=weekly_goal,
                     progress_notes=progress_notes,
@@ -204,13 +219,13 @@ def write_to_notion_running(
                 return {
                     "success": True,
                     "action": "updated",
-                    "page_id": existing_page["id"],
+                    "page_id": page_id,
                     "week": week,
                     "data": result,
                 }
-        
+
         # Create new page
-        result = create_running_page(
+        result = await acreate_running_page(
             database_id,
             week=week,
             status=status,
@@ -222,15 +237,20 @@ def write_to_notion_running(
             next_week_focus=next_week_focus,
             week_start_date=week_start_date,
         )
+        new_id = result.get("id")
+        if new_id:
+            _page_ids[(database_id, week)] = new_id
         return {
             "success": True,
             "action": "created",
-            "page_id": result.get("id"),
+            "page_id": new_id,
             "week": week,
             "data": result,
         }
-    
+
     except Exception as e:
+        # Drop the memo in case a stale page_id caused the failure
+        _page_ids.pop((database_id, week), None)
         return {
             "success": False,
             "error": str(e),
@@ -10,9 +10,8 @@ If parent_page_id is not provided, it will create the database in your workspace
 """
 
 import sys
-import requests
 
-from polar_etl.notion_utils import NOTION_BASE_URL, get_notion_headers
+from polar_etl.notion_utils import NOTION_BASE_URL, get_session, json_dumps, json_loads
 
 
 def create_running_database(parent_page_id: str = None) -> dict:
@@ -31,8 +30,7 @@ def create_running_database(parent_page_id: str = None) -> dict:
     - Next Week Focus (Rich Text) - What to focus on next week
     """
     url = f"{NOTION_BASE_URL}/databases"
-    headers = get_notion_headers()
-    
+
     # Parent - use provided page or workspace root
     if parent_page_id:
         parent = {"page_id": parent_page_id}
@@ -93,9 +91,9 @@ def create_running_database(parent_page_id: str = None) -> dict:
         "properties": properties,
     }
     
-    response = requests.post(url, headers=headers, json=payload)
+    response = get_session().post(url, data=json_dumps(payload))
     response.raise_for_status()
-    return response.json()
+    return json_loads(response.content)
 
 
 if __name__ == "__main__":
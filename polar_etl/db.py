@@ -9,12 +9,22 @@ def get_conn():
     DB_PATH.parent.mkdir(exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     conn.execute("PRAGMA foreign_keys = ON;")
+    # Make sure the indexes behind the hot ORDER BY ... DESC LIMIT queries
+    # exist even on databases created before schema.sql declared them.
+    # SQLite walks a single-column index in either direction, so separate
+    # DESC variants would be redundant.
+    for stmt in (
+        "CREATE INDEX IF NOT EXISTS idx_session_start ON sessions(ts_start);",
+        "CREATE INDEX IF NOT EXISTS idx_metrics_date ON metrics(date);",
+    ):
+        try:
+            conn.execute(stmt)
+        except sqlite3.OperationalError:
+            pass  # table not created yet; schema.sql owns table creation
     return conn
 
 
-def upsert_session(conn, s):
-    conn.execute(
-        """
+_SESSIONS_UPSERT_SQL = """
     INSERT INTO sessions (session_id, ts_start, ts_end, sport,
                           distance_m, duration_s, kcal, avg_hr, max_hr,
                           device, training_load)
@@ -30,62 +40,103 @@ def upsert_session(conn, s):
       max_hr=excluded.max_hr,
       device=excluded.device,
       training_load=excluded.training_load
-    """,
-        (
-            s["session_id"],
-            s["ts_start"],
-            s["ts_end"],
-            s["sport"],
-            s["distance_m"],
-            s["duration_s"],
-            s["kcal"],
-            s["avg_hr"],
-            s["max_hr"],
-            s["device"],
-            s["training_load"],
-        ),
+"""
+
+
+def _session_row(s):
+    return (
+        s["session_id"],
+        s["ts_start"],
+        s["ts_end"],
+        s["sport"],
+        s["distance_m"],
+        s["duration_s"],
+        s["kcal"],
+        s["avg_hr"],
+        s["max_hr"],
+        s["device"],
+        s["training_load"],
     )
 
 
-def upsert_metrics(conn, date, resting_hr=None, hrv_rmssd=None, vo2max=None, weight_kg=None, sleep_hours=None):
-    # Build the update clause dynamically to only update non-None fields
-    updates = []
-    insert_params = [date, resting_hr, hrv_rmssd, vo2max, weight_kg, sleep_hours]
-    update_params = []
-    
-    if resting_hr is not None:
-        updates.append("resting_hr=?")
-        update_params.append(resting_hr)
-    if hrv_rmssd is not None:
-        updates.append("hrv_rmssd=?")
-        update_params.append(hrv_rmssd)
-    if vo2max is not None:
-        updates.append("vo2max=?")
-        update_params.append(vo2max)
-    if weight_kg is not None:
-        updates.append("weight_kg=?")
-        update_params.append(weight_kg)
-    if sleep_hours is not None:
-        updates.append("sleep_hours=?")
-        update_params.append(sleep_hours)
-    
-    if not updates:
-        # If no fields to update, just insert the date (or do nothing on conflict)
-        conn.execute(
-            """
-            INSERT INTO metrics (date) VALUES (?)
-            ON CONFLICT(date) DO NOTHING
-            """,
-            (date,),
-        )
+def upsert_session(conn, s):
+    conn.execute(_SESSIONS_UPSERT_SQL, _session_row(s))
+
+
+def upsert_sessions_many(conn, sessions):
+    """Upsert a batch of sessions in a single transaction.
+
+    One executemany inside one transaction amortizes statement prep and
+    fsync over the whole batch instead of paying them per row.
+    """
+    rows = [_session_row(s) for s in sessions]
+    if not rows:
         return
-    
-    # Build the full query
-    update_clause = ", ".join(updates)
-    query = f"""
+    # Join the caller's transaction if one is already open
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_SESSIONS_UPSERT_SQL, rows)
+    except Exception:
+        if own_txn:
+            conn.rollback()
+        raise
+    if own_txn:
+        conn.commit()
+
+
+_METRICS_UPSERT_SQL = """
     INSERT INTO metrics (date, resting_hr, hrv_rmssd, vo2max, weight_kg, sleep_hours)
     VALUES (?, ?, ?, ?, ?, ?)
     ON CONFLICT(date) DO UPDATE SET
-      {update_clause}
+      resting_hr=COALESCE(excluded.resting_hr, metrics.resting_hr),
+      hrv_rmssd=COALESCE(excluded.hrv_rmssd, metrics.hrv_rmssd),
+      vo2max=COALESCE(excluded.vo2max, metrics.vo2max),
+      weight_kg=COALESCE(excluded.weight_kg, metrics.weight_kg),
+      sleep_hours=COALESCE(excluded.sleep_hours, metrics.sleep_hours)
+"""
+
+
+def upsert_metrics(conn, date, resting_hr=None, hrv_rmssd=None, vo2max=None, weight_kg=None, sleep_hours=None):
+    # COALESCE keeps the stored value for any column passed as None, so one
+    # constant statement covers every combination of provided fields and
+    # SQLite can reuse a single cached plan
+    conn.execute(
+        _METRICS_UPSERT_SQL,
+        (date, resting_hr, hrv_rmssd, vo2max, weight_kg, sleep_hours),
+    )
+
+
+def upsert_metrics_many(conn, metrics):
+    """Upsert a batch of daily metrics in a single transaction.
+
+    Each entry is a dict with a required "date" and any of the metric
+    columns; missing columns keep their stored values, as in
+    upsert_metrics.
     """
-    conn.execute(query, insert_params + update_params)
+    rows = [
+        (
+            m["date"],
+            m.get("resting_hr"),
+            m.get("hrv_rmssd"),
+            m.get("vo2max"),
+            m.get("weight_kg"),
+            m.get("sleep_hours"),
+        )
+        for m in metrics
+    ]
+    if not rows:
+        return
+    # Join the caller's transaction if one is already open
+    own_txn = not conn.in_transaction
+    if own_txn:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_METRICS_UPSERT_SQL, rows)
+    except Exception:
+        if own_txn:
+            conn.rollback()
+        raise
+    if own_txn:
+        conn.commit()
@@ -4,18 +4,44 @@
 import re
 from datetime import datetime, timedelta
 
+# ISO 8601 duration pattern supporting days, hours, minutes, seconds
+_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+)D)?"
+    r"T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?$"
+)
+
+
+def _fast_pt(s):
+    """Parse the common PT[nH][nM][nS] shape (no days, integer fields) without regex."""
+    total = 0
+    pos = 2
+    for unit, mult in (("H", 3600), ("M", 60), ("S", 1)):
+        idx = s.find(unit, pos)
+        if idx == -1:
+            continue
+        part = s[pos:idx]
+        if not part.isdigit():
+            return None
+        total += int(part) * mult
+        pos = idx + 1
+    if pos != len(s):
+        return None
+    return float(total)
+
 
 def parse_duration(duration_str):
     """Convert ISO 8601 duration (e.g. PT1H5M12S) to seconds"""
     if not duration_str:
         return None
 
-    # ISO 8601 duration pattern supporting days, hours, minutes, seconds
-    match = re.match(
-        r"^P(?:(?P<days>\d+)D)?"
-        r"T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?$",
-        duration_str,
-    )
+    # Fast path: Polar durations are almost always PT..H..M..S with integer
+    # fields, which simple find/slice handles without touching the regex
+    if duration_str.startswith("PT"):
+        fast = _fast_pt(duration_str)
+        if fast is not None:
+            return fast
+
+    match = _DURATION_RE.match(duration_str)
 
     if not match:
         return None
@@ -33,6 +59,45 @@ def parse_duration(duration_str):
     return total_seconds
 
 
+def _add_seconds_iso(ts, sec):
+    """Add seconds to an ISO timestamp string without building datetimes.
+
+    The common 'YYYY-MM-DDTHH:MM:SS[.fff]' case is handled with integer
+    arithmetic on the time-of-day; timezone-bearing strings and additions
+    that cross midnight fall back to datetime.
+    """
+    try:
+        date_part, time_part = ts.split("T")
+        if "+" in time_part or "-" in time_part or time_part.endswith("Z"):
+            raise ValueError  # timezone suffix: let datetime handle it
+        if (
+            len(time_part) < 5
+            or time_part[2] != ":"
+            or (len(time_part) > 5 and time_part[5] != ":")
+        ):
+            raise ValueError  # not extended HH:MM[:SS]: let datetime handle it
+        hh = int(time_part[0:2])
+        mm = int(time_part[3:5])
+        ss = float(time_part[6:]) if len(time_part) > 5 else 0.0
+        total = hh * 3600 + mm * 60 + ss + sec
+        if not 0 <= total < 86400:
+            raise ValueError  # crosses midnight: the date changes too
+        total_i = int(total)
+        frac = total - total_i
+        h, rem = divmod(total_i, 3600)
+        m, s = divmod(rem, 60)
+        if frac:
+            return f"{date_part}T{h:02d}:{m:02d}:{s + frac:09.6f}"
+        return f"{date_part}T{h:02d}:{m:02d}:{s:02d}"
+    except (ValueError, IndexError):
+        pass
+
+    try:
+        return (datetime.fromisoformat(ts) + timedelta(seconds=sec)).isoformat()
+    except ValueError:
+        return None
+
+
 def is_fitness_test(ex):
     """Check if an exercise entry is a fitness test"""
     tt = (ex.get("test") or {}).get("type") or ex.get("test_type")
@@ -73,13 +138,7 @@ def normalize_exercise(ex):
     ts_start = ex.get("start_time")
     ts_end = None
     if ts_start and duration_s:
-        try:
-            # Parse start time and add duration
-            start_dt = datetime.fromisoformat(ts_start.replace('T', ' '))
-            end_dt = start_dt + timedelta(seconds=duration_s)
-            ts_end = end_dt.isoformat()
-        except:
-            pass
+        ts_end = _add_seconds_iso(ts_start, duration_s)
     
     return {
         "session_id": session_id,
@@ -95,3 +154,78 @@ def normalize_exercise(ex):
         "training_load": training_load,
     }
 
+
+def normalize_exercises(batch):
+    """Normalize a batch of Polar exercises into sessions table format.
+
+    Uses vectorized pandas operations when pandas is installed (worthwhile
+    for multi-year exports with thousands of exercises); otherwise falls
+    back to normalizing one exercise at a time. pandas is a best-effort
+    optional extra, deliberately not pinned in requirements.txt — both
+    paths produce identical rows.
+    """
+    batch = list(batch)
+    if not batch:
+        return []
+    try:
+        import pandas as pd
+    except ImportError:
+        return [normalize_exercise(ex) for ex in batch]
+
+    df = pd.json_normalize(batch)
+
+    def col(name):
+        if name in df.columns:
+            return df[name]
+        return pd.Series(None, index=df.index, dtype=object)
+
+    session_id = col("id")
+    for alt in ("list_item_id", "transaction-id"):
+        session_id = session_id.fillna(col(alt))
+    session_id = session_id.fillna(col("url").fillna("").str.split("/").str[-1])
+
+    # Vectorized duration parse: unmatched or empty strings end up as 0.0,
+    # same as the per-exercise path
+    parts = col("duration").fillna("").str.extract(_DURATION_RE)
+    nums = parts.astype(float).fillna(0.0)
+    duration_s = (
+        nums["days"] * 86400
+        + nums["hours"] * 3600
+        + nums["minutes"] * 60
+        + nums["seconds"]
+    )
+
+    # ts_end stays row-wise through _add_seconds_iso: pd.to_datetime turns
+    # batches that mix tz-aware and tz-naive start times into NaT (or
+    # raises, depending on the pandas version), silently dropping ts_end
+    # for valid rows. _add_seconds_iso is cheap string arithmetic anyway.
+    ts_start = col("start_time")
+    ts_end = pd.Series(
+        [
+            _add_seconds_iso(start, sec) if (isinstance(start, str) and start and sec) else None
+            for start, sec in zip(ts_start, duration_s)
+        ],
+        index=df.index,
+        dtype=object,
+    )
+
+    out = pd.DataFrame(
+        {
+            "session_id": session_id,
+            "ts_start": ts_start,
+            "ts_end": ts_end,
+            "sport": col("sport").fillna("UNKNOWN"),
+            "distance_m": col("distance").fillna(0.0),
+            "duration_s": duration_s,
+            "kcal": col("calories").fillna(0.0),
+            "avg_hr": col("heart_rate.average"),
+            "max_hr": col("heart_rate.maximum").fillna(col("heart_rate.max")),
+            "device": col("device").fillna("Polar"),
+            "training_load": col("training_load").fillna(
+                col("training_load_pro.cardio-load")
+            ),
+        }
+    )
+    # Cast to object so missing numerics become None rather than NaN
+    return out.astype(object).where(out.notna(), None).to_dict("records")
+
@@ -1,30 +1,164 @@
 # polar_etl/notion_running.py
 """Write running progress and coaching data to Notion"""
 
-import requests
-from datetime import datetime
-from typing import Dict, Optional, List
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, List, Tuple
+
+import httpx
 
 from polar_etl.notion_utils import (
     NOTION_API_VERSION,
     NOTION_BASE_URL,
     extract_property_value,
-    fetch_notion_database,
     get_notion_headers,
+    invalidate_database_cache,
+    json_dumps,
+    json_loads,
 )
 
+# Shared pooled HTTP client. Keep-alive connections avoid a fresh TCP+TLS
+# handshake on every Notion call, and async lets callers overlap many page
+# writes with asyncio.gather. The client is bound to the event loop it was
+# created on, so it is rebuilt (and the stale one closed) if the loop changes.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _aclose_quietly(client: httpx.AsyncClient):
+    try:
+        await client.aclose()
+    except Exception:
+        pass
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        if _client is not None:
+            # Close the stale client on its own loop if that loop is still
+            # alive; otherwise its keep-alive sockets die with the loop.
+            if _client_loop is not None and not _client_loop.is_closed():
+                _client_loop.call_soon_threadsafe(
+                    lambda stale=_client: asyncio.ensure_future(_aclose_quietly(stale))
+                )
+        _client = httpx.AsyncClient(
+            headers=get_notion_headers(),
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        _client_loop = loop
+    return _client
+
+
+# The sync wrappers run their coroutines on one long-lived background loop
+# instead of asyncio.run: a fresh loop per call would rebuild the pooled
+# client every time, so sequential sync callers would never reuse a
+# connection (and would leak the abandoned clients' sockets).
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coro):
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, daemon=True).start()
+        loop = _sync_loop
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+# Memo of (database_id, week) -> (expiry, page) so the weekly workflow that
+# updates the same page repeatedly doesn't hit Notion on every lookup.
+# Writes invalidate so the next lookup sees fresh data.
+_WEEK_CACHE_TTL = 300.0
+_week_cache: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+
+
+def _week_of(page: Dict) -> Optional[str]:
+    week_prop = page.get("properties", {}).get("Week")
+    if not week_prop:
+        return None
+    return extract_property_value(week_prop, week_prop.get("type"))
+
+
+def _invalidate_week_cache(database_id: Optional[str] = None, week: Optional[str] = None, page_id: Optional[str] = None):
+    if database_id and week:
+        _week_cache.pop((database_id, week), None)
+    if page_id:
+        for key in [k for k, (_, page) in _week_cache.items() if page.get("id") == page_id]:
+            _week_cache.pop(key, None)
+
+
+# Maps legacy status names to the Notion database options
+_STATUS_MAP = {
+    "Planning": "Not started",
+    "In Progress": "In progress",
+    "Completed": "Done",
+}
+
 
 def _normalize_status(status: str) -> str:
     """Normalize status to match Notion database options"""
-    status_map = {
-        "Planning": "Not started",
-        "In Progress": "In progress",
-        "Completed": "Done",
-    }
-    return status_map.get(status, status)
+    return _STATUS_MAP.get(status, status)
+
+
+def _title(value) -> Dict:
+    return {"title": [{"text": {"content": value}}]}
+
+
+def _rich_text(value) -> Dict:
+    return {"rich_text": [{"text": {"content": value}}]}
+
+
+def _status(value) -> Dict:
+    return {"status": {"name": _normalize_status(value)}}
+
 
+def _date(value) -> Dict:
+    return {"date": {"start": value}}
 
-def create_running_page(
+
+def _action_items(value) -> Dict:
+    if isinstance(value, list):
+        # Use multi-select if multiple items, or rich_text if single
+        if len(value) == 1:
+            return _rich_text(value[0])
+        return {"multi_select": [{"name": item} for item in value]}
+    return _rich_text(str(value))
+
+
+# Maps keyword-argument name -> (Notion property name, builder). Both page
+# writers build their properties from this table instead of repeating one
+# if-stanza per field.
+_FIELD_BUILDERS = {
+    "status": ("Status", _status),
+    "week_start_date": ("Date", _date),
+    "weekly_goal": ("Weekly Goal", _rich_text),
+    "progress_notes": ("Progress Notes", _rich_text),
+    "action_items": ("Action Items", _action_items),
+    "distance_km": ("Distance This Week", lambda v: {"number": float(v)}),
+    "sessions_count": ("Sessions This Week", lambda v: {"number": int(v)}),
+    "next_week_focus": ("Next Week Focus", _rich_text),
+}
+
+# Number fields are included when present, even if zero
+_NUMBER_FIELDS = frozenset({"distance_km", "sessions_count"})
+
+
+def _build_properties(fields: Dict) -> Dict:
+    properties: Dict = {}
+    for arg_name, value in fields.items():
+        if (value is None) if arg_name in _NUMBER_FIELDS else (not value):
+            continue
+        prop_name, builder = _FIELD_BUILDERS[arg_name]
+        properties[prop_name] = builder(value)
+    return properties
+
+
+async def acreate_running_page(
     database_id: str,
     week: str,
     status: str = "In progress",
@@ -55,120 +189,70 @@ def create_running_page(
         Created page data
     """
     url = f"{NOTION_BASE_URL}/pages"
-    headers = get_notion_headers()
-    
-    # Build properties
-    properties = {
-        "Week": {
-            "title": [
-                {
-                    "text": {
-                        "content": week
-                    }
-                }
-            ]
-        },
-        "Status": {
-            "status": {
-                "name": _normalize_status(status)
-            }
-        }
-    }
-    
-    # Add optional fields
-    if week_start_date:
-        properties["Date"] = {
-            "date": {
-                "start": week_start_date
-            }
-        }
-    
-    if weekly_goal:
-        properties["Weekly Goal"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": weekly_goal
-                    }
-                }
-            ]
-        }
-    
-    if progress_notes:
-        properties["Progress Notes"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": progress_notes
-                    }
-                }
-            ]
-        }
-    
-    if action_items:
-        if isinstance(action_items, list):
-            # Use multi-select if multiple items, or rich_text if single
-            if len(action_items) == 1:
-                properties["Action Items"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": action_items[0]
-                            }
-                        }
-                    ]
-                }
-            else:
-                properties["Action Items"] = {
-                    "multi_select": [
-                        {"name": item} for item in action_items
-                    ]
-                }
-        else:
-            properties["Action Items"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": str(action_items)
-                        }
-                    }
-                ]
+
+    properties = {"Week": _title(week)}
+    properties.update(
+        _build_properties(
+            {
+                "status": status,
+                "week_start_date": week_start_date,
+                "weekly_goal": weekly_goal,
+                "progress_notes": progress_notes,
+                "action_items": action_items,
+                "distance_km": distance_km,
+                "sessions_count": sessions_count,
+                "next_week_focus": next_week_focus,
             }
-    
-    if distance_km is not None:
-        properties["Distance This Week"] = {
-            "number": float(distance_km)
-        }
-    
-    if sessions_count is not None:
-        properties["Sessions This Week"] = {
-            "number": int(sessions_count)
-        }
-    
-    if next_week_focus:
-        properties["Next Week Focus"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": next_week_focus
-                    }
-                }
-            ]
-        }
-    
+        )
+    )
+
     payload = {
         "parent": {
             "database_id": database_id
         },
         "properties": properties
     }
-    
-    response = requests.post(url, headers=headers, json=payload)
+
+    response = await _get_client().post(url, content=json_dumps(payload))
     response.raise_for_status()
-    return response.json()
+    _invalidate_week_cache(database_id=database_id, week=week)
+    invalidate_database_cache(database_id)
+    return json_loads(response.content)
+
+
+def create_running_page(*args, **kwargs) -> Dict:
+    """Synchronous wrapper around acreate_running_page for existing callers."""
+    return _run_sync(acreate_running_page(*args, **kwargs))
+
+
+async def create_running_pages_many(
+    database_id: str, records: List[Dict], max_concurrency: int = 5
+) -> List[Dict]:
+    """
+    Create many pages in the running database concurrently.
+
+    Notion has no true bulk-create endpoint, so the closest batched write
+    is overlapping individual POSTs on the pooled client; the semaphore
+    keeps concurrent requests bounded to stay under Notion's rate limit.
+
+    Args:
+        database_id: Notion database ID
+        records: Keyword-argument dicts for acreate_running_page
+        max_concurrency: Maximum in-flight requests
+
+    Returns:
+        Created page data, in the same order as records
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(record: Dict) -> Dict:
+        async with sem:
+            return await acreate_running_page(database_id, **record)
+
+    return await asyncio.gather(*(_one(r) for r in records))
 
 
-def update_running_page(
+async def aupdate_running_page(
     page_id: str,
     status: Optional[str] = None,
     weekly_goal: Optional[str] = None,
@@ -195,111 +279,67 @@ def update_running_page(
         Updated page data
     """
     url = f"{NOTION_BASE_URL}/pages/{page_id}"
-    headers = get_notion_headers()
-    
-    properties = {}
-    
-    if status:
-        properties["Status"] = {
-            "status": {
-                "name": _normalize_status(status)
-            }
-        }
-    
-    if weekly_goal:
-        properties["Weekly Goal"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": weekly_goal
-                    }
-                }
-            ]
-        }
-    
-    if progress_notes:
-        properties["Progress Notes"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": progress_notes
-                    }
-                }
-            ]
-        }
-    
-    if action_items:
-        if isinstance(action_items, list):
-            if len(action_items) == 1:
-                properties["Action Items"] = {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": action_items[0]
-                            }
-                        }
-                    ]
-                }
-            else:
-                properties["Action Items"] = {
-                    "multi_select": [
-                        {"name": item} for item in action_items
-                    ]
-                }
-        else:
-            properties["Action Items"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": str(action_items)
-                        }
-                    }
-                ]
-            }
-    
-    if distance_km is not None:
-        properties["Distance This Week"] = {
-            "number": float(distance_km)
-        }
-    
-    if sessions_count is not None:
-        properties["Sessions This Week"] = {
-            "number": int(sessions_count)
-        }
-    
-    if next_week_focus:
-        properties["Next Week Focus"] = {
-            "rich_text": [
-                {
-                    "text": {
-                        "content": next_week_focus
-                    }
-                }
-            ]
+
+    properties = _build_properties(
+        {
+            "status": status,
+            "weekly_goal": weekly_goal,
+            "progress_notes": progress_notes,
+            "action_items": action_items,
+            "distance_km": distance_km,
+            "sessions_count": sessions_count,
+            "next_week_focus": next_week_focus,
         }
-    
+    )
+
     if not properties:
         raise ValueError("At least one property must be provided for update")
     
     payload = {
         "properties": properties
     }
-    
-    response = requests.patch(url, headers=headers, json=payload)
+
+    response = await _get_client().patch(url, content=json_dumps(payload))
     response.raise_for_status()
-    return response.json()
+    _invalidate_week_cache(page_id=page_id)
+    invalidate_database_cache()  # only the page_id is known here
+    return json_loads(response.content)
 
 
-def find_running_page_by_week(database_id: str, week: str) -> Optional[Dict]:
+def update_running_page(*args, **kwargs) -> Dict:
+    """Synchronous wrapper around aupdate_running_page for existing callers."""
+    return _run_sync(aupdate_running_page(*args, **kwargs))
+
+
+async def afind_running_page_by_week(database_id: str, week: str) -> Optional[Dict]:
     """Find a page by week name"""
-    pages = fetch_notion_database(database_id)
-    for page in pages:
-        properties = page.get("properties", {})
-        week_prop = properties.get("Week")
-        if week_prop:
-            week_type = week_prop.get("type")
-            week_title = extract_property_value(week_prop, week_type)
-            if week_title == week:
-                return page
-    return None
+    now = time.monotonic()
+    cached = _week_cache.get((database_id, week))
+    if cached and cached[0] > now:
+        return cached[1]
+
+    # Push the title match down to Notion: the server returns at most one
+    # page instead of shipping the whole database for a client-side scan.
+    url = f"{NOTION_BASE_URL}/databases/{database_id}/query"
+    payload = {
+        "filter": {"property": "Week", "title": {"equals": week}},
+        "page_size": 1,
+    }
+    response = await _get_client().post(url, content=json_dumps(payload))
+    response.raise_for_status()
+    results = json_loads(response.content).get("results", [])
+    if not results:
+        return None
+
+    page = results[0]
+    # Defensive re-verification of the server-side match
+    if _week_of(page) != week:
+        return None
+    _week_cache[(database_id, week)] = (now + _WEEK_CACHE_TTL, page)
+    return page
+
+
+def find_running_page_by_week(database_id: str, week: str) -> Optional[Dict]:
+    """Synchronous wrapper around afind_running_page_by_week."""
+    return _run_sync(afind_running_page_by_week(database_id, week))
 
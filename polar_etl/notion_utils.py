@@ -1,10 +1,14 @@
 """Shared helpers for interacting with the Notion API."""
 
 import os
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
 
 import requests
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env if present (for NOTION_SECRET, etc.)
 load_dotenv()
@@ -12,6 +16,26 @@ load_dotenv()
 NOTION_API_VERSION = "2022-06-28"
 NOTION_BASE_URL = "https://api.notion.com/v1"
 
+# Prefer orjson for (de)serializing Notion payloads; it is markedly faster
+# than stdlib json on the multi-page responses the API returns.
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+except ImportError:
+    import json
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def json_loads(data):
+        return json.loads(data)
+
 
 def _get_secret() -> str:
     secret = os.getenv("NOTION_SECRET", "")
@@ -23,8 +47,13 @@ def _get_secret() -> str:
     return secret
 
 
+@lru_cache(maxsize=1)
 def get_notion_headers() -> Dict[str, str]:
-    """Return the standard headers required for Notion API requests."""
+    """Return the standard headers required for Notion API requests.
+
+    The secret is fixed for the process lifetime, so the dict is built once
+    and reused; both HTTP clients copy it into their own header stores.
+    """
     secret = _get_secret()
     return {
         "Authorization": f"Bearer {secret}",
@@ -33,54 +62,118 @@ def get_notion_headers() -> Dict[str, str]:
     }
 
 
-def fetch_notion_database(database_id: str) -> List[Dict]:
-    """Fetch all pages from a Notion database."""
+# Shared session for synchronous Notion calls: keep-alive pooling avoids a
+# TCP+TLS handshake per request, and the mounted retry policy backs off on
+# 429s (Notion rate-limits) and transient 5xx. Created lazily so importing
+# this module doesn't require NOTION_SECRET to be set.
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared requests.Session for Notion API calls."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.headers.update(get_notion_headers())
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=10,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.2,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                ),
+            ),
+        )
+        _session = session
+    return _session
+
+
+def iter_notion_pages(database_id: str, filter: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield pages from a Notion database one at a time.
+
+    Streaming keeps peak memory at one response page, and callers that stop
+    iterating early never download the trailing pages. An optional filter
+    dict is passed through to the query endpoint. Each request asks for the
+    Notion maximum of 100 results so a full walk uses the fewest round
+    trips.
+    """
     url = f"{NOTION_BASE_URL}/databases/{database_id}/query"
-    headers = get_notion_headers()
+    session = get_session()
 
-    all_pages: List[Dict] = []
     has_more = True
     start_cursor: Optional[str] = None
 
     while has_more:
-        payload: Dict[str, str] = {}
+        payload: Dict = {"page_size": 100}
+        if filter:
+            payload["filter"] = filter
         if start_cursor:
             payload["start_cursor"] = start_cursor
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = session.post(url, data=json_dumps(payload))
         response.raise_for_status()
 
-        data = response.json()
-        all_pages.extend(data.get("results", []))
+        data = json_loads(response.content)
+        yield from data.get("results", [])
 
         has_more = data.get("has_more", False)
         start_cursor = data.get("next_cursor")
 
-    return all_pages
+
+# Short-lived result cache so workflows that read the same database
+# back-to-back (debug script plus a lookup, repeated tool calls) don't
+# re-download it each time. Writers invalidate via invalidate_database_cache.
+_db_cache: TTLCache = TTLCache(maxsize=64, ttl=60)
+
+
+def fetch_notion_database(database_id: str) -> List[Dict]:
+    """Fetch all pages from a Notion database (results cached for 60s)."""
+    try:
+        return _db_cache[database_id]
+    except KeyError:
+        pages = list(iter_notion_pages(database_id))
+        _db_cache[database_id] = pages
+        return pages
+
+
+def invalidate_database_cache(database_id: Optional[str] = None):
+    """Drop cached pages for one database, or for all of them."""
+    if database_id is None:
+        _db_cache.clear()
+    else:
+        _db_cache.pop(database_id, None)
+
+
+def _extract_formula(prop: Dict):
+    formula = prop.get("formula")
+    if formula:
+        formula_type = formula.get("type")
+        if formula_type == "number":
+            return formula.get("number")
+        if formula_type == "string":
+            return formula.get("string")
+    return None
+
+
+# Per-type extractors: called for every property of every page, so an O(1)
+# dict dispatch beats walking an if/elif chain of string compares
+_EXTRACTORS = {
+    "title": lambda p: "".join(t.get("plain_text", "") for t in p.get("title", ())),
+    "rich_text": lambda p: "".join(t.get("plain_text", "") for t in p.get("rich_text", ())),
+    "number": lambda p: p.get("number"),
+    "date": lambda p: (p.get("date") or {}).get("start"),
+    "checkbox": lambda p: p.get("checkbox", False),
+    "formula": _extract_formula,
+}
 
 
 def extract_property_value(prop: Dict, prop_type: str) -> Optional[any]:
     """Extract a usable value from a Notion property based on its type."""
-    if prop_type == "title":
-        return "".join([text.get("plain_text", "") for text in prop.get("title", [])])
-    if prop_type == "rich_text":
-        return "".join([text.get("plain_text", "") for text in prop.get("rich_text", [])])
-    if prop_type == "number":
-        return prop.get("number")
-    if prop_type == "date":
-        date_obj = prop.get("date")
-        if date_obj:
-            return date_obj.get("start")
+    extractor = _EXTRACTORS.get(prop_type)
+    if extractor is None:
         return None
-    if prop_type == "checkbox":
-        return prop.get("checkbox", False)
-    if prop_type == "formula":
-        formula = prop.get("formula")
-        if formula:
-            formula_type = formula.get("type")
-            if formula_type == "number":
-                return formula.get("number")
-            if formula_type == "string":
-                return formula.get("string")
-    return None
+    return extractor(prop)
 
@@ -12,8 +12,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "accesslink-example-python
 from utils import load_config  # type: ignore
 from accesslink import AccessLink  # type: ignore
 
-from polar_etl.db import get_conn, upsert_session, upsert_metrics
-from polar_etl.normalize import normalize_exercise, is_fitness_test, parse_fitness_test
+from polar_etl.db import get_conn, upsert_sessions_many, upsert_metrics, upsert_metrics_many
+from polar_etl.normalize import normalize_exercises, is_fitness_test, parse_fitness_test
 
 CONFIG_FILENAME = "accesslink-example-python/config.yml"
 TOKEN_FILENAME = "accesslink-example-python/usertokens.yml"
@@ -27,6 +27,17 @@ REDIRECT_URL = f"http://localhost:{CALLBACK_PORT}{CALLBACK_ENDPOINT}"
 def _extract_date(value: str) -> str | None:
     if not value:
         return None
+    # Fast path: a well-formed "YYYY-MM-DD..." prefix is the common case,
+    # and slicing it avoids building a datetime just to re-serialize the date
+    if (
+        len(value) >= 10
+        and value[4] == "-"
+        and value[7] == "-"
+        and value[:4].isdigit()
+        and value[5:7].isdigit()
+        and value[8:10].isdigit()
+    ):
+        return value[:10]
     trimmed = value.strip()
     if not trimmed:
         return None
@@ -38,29 +49,39 @@ def _extract_date(value: str) -> str | None:
         return trimmed[:10]
 
 
-def _propagate_latest_metric(conn, column: str, param_name: str):
-    latest_row = conn.execute(
-        f"SELECT date, {column} FROM metrics ORDER BY date DESC LIMIT 1"
-    ).fetchone()
-    if not latest_row:
+# One round trip answers every propagation: the latest row's current values
+# alongside the most recent non-NULL value for each column
+_PROPAGATE_SQL = """
+    WITH latest AS (SELECT date FROM metrics ORDER BY date DESC LIMIT 1)
+    SELECT l.date,
+           (SELECT weight_kg   FROM metrics WHERE date = l.date),
+           (SELECT weight_kg   FROM metrics WHERE weight_kg   IS NOT NULL ORDER BY date DESC LIMIT 1),
+           (SELECT resting_hr  FROM metrics WHERE date = l.date),
+           (SELECT resting_hr  FROM metrics WHERE resting_hr  IS NOT NULL ORDER BY date DESC LIMIT 1),
+           (SELECT vo2max      FROM metrics WHERE date = l.date),
+           (SELECT vo2max      FROM metrics WHERE vo2max      IS NOT NULL ORDER BY date DESC LIMIT 1)
+    FROM latest l
+"""
+
+
+def _propagate_latest_metrics(conn):
+    """Fill gaps in the latest metrics row from the most recent prior values."""
+    row = conn.execute(_PROPAGATE_SQL).fetchone()
+    if not row:
         return
 
-    latest_date, latest_value = latest_row
-    if latest_value is not None:
-        return
-
-    source_row = conn.execute(
-        f"SELECT {column} FROM metrics WHERE {column} IS NOT NULL ORDER BY date DESC LIMIT 1"
-    ).fetchone()
+    latest_date = row[0]
+    fills = {}
+    for param, current, source in (
+        ("weight_kg", row[1], row[2]),
+        ("resting_hr", row[3], row[4]),
+        ("vo2max", row[5], row[6]),
+    ):
+        if current is None and source is not None:
+            fills[param] = source
 
-    if not source_row:
-        return
-
-    value = source_row[0]
-    if value is None:
-        return
-
-    upsert_metrics(conn, latest_date, **{param_name: value})
+    if fills:
+        upsert_metrics(conn, latest_date, **fills)
 
 
 def sync_physical_info(accesslink: AccessLink, tokens):
@@ -145,12 +166,7 @@ def sync_physical_info(accesslink: AccessLink, tokens):
                     upsert_metrics(conn, latest_date, weight_kg=weight)
 
         # Ensure the latest row has values if prior measurements exist
-        for column, param in (
-            ("weight_kg", "weight_kg"),
-            ("resting_hr", "resting_hr"),
-            ("vo2max", "vo2max"),
-        ):
-            _propagate_latest_metric(conn, column, param)
+        _propagate_latest_metrics(conn)
 
 
 def main():
@@ -171,15 +187,20 @@ def main():
             access_token = item["access_token"]
 
             exercises = accesslink.get_exercises(access_token=access_token)
+            runs = []
+            tests = []
             for ex in exercises:
                 if is_fitness_test(ex):
                     d, rhr, rmssd, vo2 = parse_fitness_test(ex)
                     if d:
-                        upsert_metrics(conn, d, resting_hr=rhr, hrv_rmssd=rmssd, vo2max=vo2)
+                        tests.append(
+                            {"date": d, "resting_hr": rhr, "hrv_rmssd": rmssd, "vo2max": vo2}
+                        )
                 else:
-                    s = normalize_exercise(ex)
-                    if s["session_id"]:
-                        upsert_session(conn, s)
+                    runs.append(ex)
+            upsert_metrics_many(conn, tests)
+            sessions = [s for s in normalize_exercises(runs) if s["session_id"]]
+            upsert_sessions_many(conn, sessions)
         
         conn.commit()
     
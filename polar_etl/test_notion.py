@@ -4,29 +4,28 @@
 import sys
 import re
 
-from polar_etl.notion_utils import NOTION_BASE_URL, get_notion_headers
+from polar_etl.notion_utils import NOTION_BASE_URL, get_session
+
+# Pattern: https://www.notion.so/workspace/DATABASE_ID?v=...
+# or: https://www.notion.so/DATABASE_ID?v=...
+_DB_ID_RE = re.compile(r'notion\.so/(?:[^/]+/)?([a-f0-9]{32})')
 
 def extract_database_id_from_url(url: str) -> str:
     """Extract database ID from Notion URL"""
-    # Pattern: https://www.notion.so/workspace/DATABASE_ID?v=...
-    # or: https://www.notion.so/DATABASE_ID?v=...
-    match = re.search(r'notion\.so/(?:[^/]+/)?([a-f0-9]{32})', url)
+    match = _DB_ID_RE.search(url)
     if match:
         db_id = match.group(1)
         # Format as UUID with hyphens
-        return f"{db_id[:8]}-{db_id[8:12]}-{db_id[12:16]}-{db_id[16:20]}-{db_id[20:]}"
+        return f"{db_id[:8]}-{db_id[8:12]}-{db_id[12:16]}-{db_id[16:20]}-{db_id[20:32]}"
     return None
 
 def test_notion_connection():
     """Test connection to Notion API"""
-    import requests
-    
     # Test with a simple API call
     url = f"{NOTION_BASE_URL}/users/me"
-    headers = get_notion_headers()
-    
+
     try:
-        response = requests.get(url, headers=headers)
+        response = get_session().get(url)
         response.raise_for_status()
         user_info = response.json()
         print(f"✓ Successfully connected to Notion API")
@@ -38,20 +37,17 @@ def test_notion_connection():
 
 def list_databases():
     """List accessible databases (requires search API)"""
-    import requests
-    
     url = f"{NOTION_BASE_URL}/search"
-    headers = get_notion_headers()
-    
+
     payload = {
         "filter": {
             "value": "database",
             "property": "object"
         }
     }
-    
+
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = get_session().post(url, json=payload)
         response.raise_for_status()
         results = response.json().get("results", [])
         